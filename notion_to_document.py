@@ -1,4 +1,5 @@
 import os
+import sys
 import requests
 import json
 from PIL import Image
@@ -96,21 +97,87 @@ def format_filter_summary(filter_obj):
     return "UNKNOWN_FILTER"
 
 
-def add_rich_text_to_paragraph(paragraph, rich_texts):
+# Annotation bit flags for compact rich text fragments
+ANNOTATION_BOLD = 1
+ANNOTATION_ITALIC = 2
+ANNOTATION_STRIKETHROUGH = 4
+ANNOTATION_UNDERLINE = 8
+ANNOTATION_CODE = 16
+
+ANNOTATION_FLAGS = (
+    ('bold', ANNOTATION_BOLD),
+    ('italic', ANNOTATION_ITALIC),
+    ('strikethrough', ANNOTATION_STRIKETHROUGH),
+    ('underline', ANNOTATION_UNDERLINE),
+    ('code', ANNOTATION_CODE),
+)
+
+EMPTY_CHILDREN = ()
+
+
+class CompactBlock:
+    # Keeps only the fields process_blocks reads; the raw Notion JSON is dropped.
+    # rich_text is a tuple of (interned text, annotation flags) pairs and
+    # children is a tuple of CompactBlock.
+    __slots__ = ('id', 'type', 'rich_text', 'checked', 'url', 'title', 'children')
+
+    def __init__(self, block_id, block_type, rich_text=(), checked=False, url=None, title=None, children=EMPTY_CHILDREN):
+        self.id = block_id
+        self.type = block_type
+        self.rich_text = rich_text
+        self.checked = checked
+        self.url = url
+        self.title = title
+        self.children = children
+
+
+def compact_rich_text(rich_texts):
+    fragments = []
     for rt in rich_texts:
-        text_content = rt['plain_text']
         annotations = rt['annotations']
-        
+        flags = 0
+        for name, flag in ANNOTATION_FLAGS:
+            if annotations[name]:
+                flags |= flag
+        fragments.append((sys.intern(rt['plain_text']), flags))
+    return tuple(fragments)
+
+def compact_block(block, children=EMPTY_CHILDREN):
+    block_type = sys.intern(block['type'])
+    payload = block.get(block_type) or {}
+
+    rich_text = ()
+    if 'rich_text' in payload:
+        rich_text = compact_rich_text(payload['rich_text'])
+
+    url = None
+    if block_type == 'image':
+        url = payload['file']['url'] if 'file' in payload else payload['external']['url']
+
+    title = payload.get('title') if block_type == 'child_page' else None
+
+    return CompactBlock(
+        block['id'],
+        block_type,
+        rich_text=rich_text,
+        checked=bool(payload.get('checked', False)),
+        url=url,
+        title=title,
+        children=children,
+    )
+
+def add_rich_text_to_paragraph(paragraph, rich_texts):
+    for text_content, flags in rich_texts:
         run = paragraph.add_run(text_content)
-        if annotations['bold']:
+        if flags & ANNOTATION_BOLD:
             run.bold = True
-        if annotations['italic']:
+        if flags & ANNOTATION_ITALIC:
             run.italic = True
-        if annotations['strikethrough']:
+        if flags & ANNOTATION_STRIKETHROUGH:
             run.strike = True
-        if annotations['underline']:
+        if flags & ANNOTATION_UNDERLINE:
             run.underline = True
-        if annotations['code']:
+        if flags & ANNOTATION_CODE:
             run.font.name = 'Courier New'
             run.font.size = 10000
 
@@ -154,13 +221,23 @@ async def get_block_children(notion_client, block_id):
     response = await notion_client.blocks.children.list(block_id=block_id)
     return response['results']
 
-async def process_blocks(notion_client, document, blocks, level=0):
+async def fetch_block_tree(notion_client, block_id):
+    blocks = await get_block_children(notion_client, block_id)
+    compact_blocks = []
+    for block in blocks:
+        children = EMPTY_CHILDREN
+        if block['has_children']:
+            children = await fetch_block_tree(notion_client, block['id'])
+        compact_blocks.append(compact_block(block, children))
+    return tuple(compact_blocks)
+
+def process_blocks(document, blocks, level=0):
     for block in blocks:
-        block_type = block['type']
+        block_type = block.type
         
         if block_type == 'paragraph':
             paragraph = document.add_paragraph()
-            add_rich_text_to_paragraph(paragraph, block['paragraph']['rich_text'])
+            add_rich_text_to_paragraph(paragraph, block.rich_text)
         
         elif block_type.startswith('heading'):
             heading_level = int(block_type[-1])
@@ -172,35 +249,29 @@ async def process_blocks(notion_client, document, blocks, level=0):
                 paragraph = document.add_heading('', level=3)
             else:
                 paragraph = document.add_paragraph(style='Normal')
-            add_rich_text_to_paragraph(paragraph, block[block_type]['rich_text'])
+            add_rich_text_to_paragraph(paragraph, block.rich_text)
 
         elif block_type == 'bulleted_list_item':
             paragraph = document.add_paragraph(style='List Bullet')
             paragraph.paragraph_format.left_indent = Inches(0.25 * level)
-            add_rich_text_to_paragraph(paragraph, block['bulleted_list_item']['rich_text'])
-            if block['has_children']:
-                nested_blocks = await get_block_children(notion_client, block['id'])
-                await process_blocks(notion_client, document, nested_blocks, level + 1)
+            add_rich_text_to_paragraph(paragraph, block.rich_text)
 
         elif block_type == 'numbered_list_item':
             paragraph = document.add_paragraph(style='List Number')
             paragraph.paragraph_format.left_indent = Inches(0.25 * level)
-            add_rich_text_to_paragraph(paragraph, block['numbered_list_item']['rich_text'])
-            if block['has_children']:
-                nested_blocks = await get_block_children(notion_client, block['id'])
-                await process_blocks(notion_client, document, nested_blocks, level + 1)
+            add_rich_text_to_paragraph(paragraph, block.rich_text)
 
         elif block_type == 'to_do':
             paragraph = document.add_paragraph()
-            create_checkbox(paragraph, block['to_do']['checked'])
-            add_rich_text_to_paragraph(paragraph, block['to_do']['rich_text'])
+            create_checkbox(paragraph, block.checked)
+            add_rich_text_to_paragraph(paragraph, block.rich_text)
 
         elif block_type == 'image':
-            image_url = block['image']['file']['url'] if 'file' in block['image'] else block['image']['external']['url']
+            image_url = block.url
             try:
                 response = requests.get(image_url)
                 response.raise_for_status()
-                image_path = f"temp_image_{block['id']}.png"
+                image_path = f"temp_image_{block.id}.png"
                 with open(image_path, 'wb') as f:
                     f.write(response.content)
                 
@@ -240,14 +311,13 @@ async def process_blocks(notion_client, document, blocks, level=0):
                 document.add_paragraph(f"Error processing image {image_url}: {e}")
 
         elif block_type == 'child_page':
-            document.add_paragraph(f"--- Child Page: {block['child_page']['title']} ---")
+            document.add_paragraph(f"--- Child Page: {block.title} ---")
 
         elif block_type == 'unsupported':
             document.add_paragraph(f"Unsupported block type: {block_type}")
         
-        if block['has_children'] and block_type not in ['bulleted_list_item', 'numbered_list_item']:
-            child_blocks = await get_block_children(notion_client, block['id'])
-            await process_blocks(notion_client, document, child_blocks, level + 1)
+        if block.children:
+            process_blocks(document, block.children, level + 1)
 
 
 def get_user_filters(filter_history, available_properties):
@@ -568,8 +638,8 @@ async def main():
             
             print(f"Processing ticket: {page_title} (ID: {page_id})")
 
-            page_blocks = await get_block_children(notion_client_instance, page_id)
-            await process_blocks(notion_client_instance, document, page_blocks)
+            page_blocks = await fetch_block_tree(notion_client_instance, page_id)
+            process_blocks(document, page_blocks)
             
             divider_paragraph = document.add_paragraph()
             divider_paragraph.add_run("--- END OF TICKET ---").bold = True